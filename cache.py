@@ -0,0 +1,137 @@
+"""Async TTL cache for Riot API responses."""
+
+# Standard library imports
+import asyncio
+import functools
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+_MISSING = object()
+
+async def coalesce(
+    inflight: dict[str, asyncio.Task],
+    key: str,
+    make_coro: Callable[[], Awaitable[Any]],
+) -> Any:
+    """Await the in-flight task for a key, starting one if none is running.
+
+    Concurrent callers with the same key share one task and its result or
+    exception. The task runs on its own, so a cancelled caller does not
+    cancel it for the others, and it is removed from ``inflight`` when done.
+
+    Args:
+        inflight: Running tasks by key
+        key: The key identifying the work
+        make_coro: Function returning the coroutine to run when no task is running
+
+    Returns:
+        The result of the task
+    """
+    task = inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(make_coro())
+        inflight[key] = task
+        task.add_done_callback(lambda _: inflight.pop(key, None))
+    return await asyncio.shield(task)
+
+class AsyncTTLCache:
+    """A time-based cache for the results of async fetches.
+
+    Concurrent fetches for the same key are coalesced into one task whose
+    result, or exception, is shared by every caller waiting on it.
+    """
+
+    def __init__(self, ttl: float, negative_ttl: float | None = None, maxsize: int = 1024):
+        """Create a cache.
+
+        Args:
+            ttl: Seconds to keep a result
+            negative_ttl: Seconds to keep a None result, defaults to ttl
+            maxsize: Maximum number of entries, the oldest entry is dropped first
+        """
+        self.ttl = ttl
+        self.negative_ttl = ttl if negative_ttl is None else negative_ttl
+        self.maxsize = maxsize
+        self._data: dict[str, tuple[float, Any]] = {}
+        self._inflight: dict[str, asyncio.Task] = {}
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get a cached value without fetching.
+
+        Args:
+            key: The cache key
+            default: Value returned if the key is missing or expired
+
+        Returns:
+            The cached value, or default
+        """
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return default
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a value, using the negative TTL if the value is None."""
+        ttl = self.negative_ttl if value is None else self.ttl
+        self._data.pop(key, None)
+        if len(self._data) >= self.maxsize:
+            del self._data[next(iter(self._data))]
+        self._data[key] = (time.monotonic() + ttl, value)
+
+    def clear(self) -> None:
+        """Remove all cached values."""
+        self._data.clear()
+
+    async def get_or_fetch(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Get a cached value, fetching and storing it on a miss.
+
+        Args:
+            key: The cache key
+            fetch: Coroutine function called to produce the value on a miss
+
+        Returns:
+            The cached or freshly fetched value
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        return await coalesce(self._inflight, key, lambda: self._fetch_and_store(key, fetch))
+
+    async def _fetch_and_store(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        value = await fetch()
+        self.set(key, value)
+        return value
+
+def ttl_cache(
+    ttl: float,
+    key: Callable[..., str],
+    negative_ttl: float | None = None,
+) -> Callable[[Callable[..., Awaitable[Any]]], Callable[..., Awaitable[Any]]]:
+    """Decorate a coroutine function with an AsyncTTLCache.
+
+    The cache is available as the ``cache`` attribute of the decorated function.
+
+    Args:
+        ttl: Seconds to keep a result
+        key: Function that builds the cache key, called with the same
+            arguments as the decorated function
+        negative_ttl: Seconds to keep a None result, defaults to ttl
+    """
+    def decorator(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        cache = AsyncTTLCache(ttl, negative_ttl)
+
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            return await cache.get_or_fetch(
+                key(*args, **kwargs), lambda: func(*args, **kwargs)
+            )
+
+        wrapper.cache = cache
+        return wrapper
+    return decorator
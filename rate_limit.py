@@ -0,0 +1,125 @@
+"""Client-side rate limiting for the Riot API."""
+
+# Standard library imports
+import asyncio
+import time
+from collections import deque
+from collections.abc import Iterable, Mapping
+
+class SlidingWindow:
+    """A log of request times for one rate limit window.
+
+    A request is allowed when fewer than ``limit`` requests were made in the
+    last ``period`` seconds, so no window of that length ever holds more than
+    ``limit`` requests.
+    """
+
+    def __init__(self, limit: int, period: float):
+        """Create an empty window.
+
+        Args:
+            limit: Number of requests allowed per period
+            period: Length of the period in seconds
+        """
+        self.limit = limit
+        self.period = period
+        self._log: deque[float] = deque()
+
+    def _prune(self, now: float) -> None:
+        while self._log and self._log[0] <= now - self.period:
+            self._log.popleft()
+
+    def delay(self, now: float) -> float:
+        """Get the seconds to wait before another request is allowed."""
+        self._prune(now)
+        if len(self._log) < self.limit:
+            return 0.0
+        return self._log[-self.limit] + self.period - now
+
+    def record(self, now: float) -> None:
+        """Record a request made at the given time."""
+        self._log.append(now)
+
+    def sync(self, count: int, now: float) -> None:
+        """Account for requests the server has counted but this log has not.
+
+        Unseen requests are recorded as made now, which keeps them in the log
+        for a full period and errs on the side of waiting too long.
+        """
+        self._prune(now)
+        for _ in range(min(count, self.limit) - len(self._log)):
+            self._log.append(now)
+
+class RiotRateLimiter:
+    """Application rate limiter with one sliding window per Riot limit."""
+
+    def __init__(self, limits: Iterable[tuple[int, int]]):
+        """Create a rate limiter.
+
+        Args:
+            limits: (requests, seconds) pairs, e.g. ((20, 1), (100, 120))
+        """
+        self.windows = {period: SlidingWindow(limit, period) for limit, period in limits}
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every request for the given number of seconds.
+
+        Used when the API reports the limit as exceeded, so all callers wait
+        for the Retry-After period instead of only the one that was rejected.
+        """
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def paused_for(self) -> float:
+        """Get the seconds left before requests are allowed again after a pause."""
+        return max(0.0, self._paused_until - time.monotonic())
+
+    async def acquire(self, max_pause: float | None = None) -> bool:
+        """Wait until a request is allowed by every limit window and any pause has ended.
+
+        Waiting callers are served in order, so a burst of requests is spread
+        out instead of being rejected by the API.
+
+        Args:
+            max_pause: Longest pause to wait out, no limit if None
+
+        Returns:
+            bool: True once the request is allowed, False without waiting
+                further if a longer pause is in effect
+        """
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if max_pause is not None and self._paused_until - now > max_pause:
+                    return False
+                wait = max(
+                    self._paused_until - now,
+                    *(window.delay(now) for window in self.windows.values())
+                )
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+            for window in self.windows.values():
+                window.record(now)
+            return True
+
+    def update(self, headers: Mapping[str, str]) -> None:
+        """Sync the windows with the counts reported by the Riot API.
+
+        Args:
+            headers: Response headers, read for X-App-Rate-Limit-Count
+                in the "count:seconds,count:seconds" format
+        """
+        counts = headers.get("X-App-Rate-Limit-Count")
+        if not counts:
+            return
+        now = time.monotonic()
+        for entry in counts.split(","):
+            try:
+                count, period = (int(part) for part in entry.split(":"))
+            except ValueError:
+                continue
+            window = self.windows.get(period)
+            if window is not None:
+                window.sync(count, now)
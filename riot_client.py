@@ -0,0 +1,557 @@
+"""Riot API client used by the MCP server tools."""
+
+# Standard library imports
+import asyncio
+import functools
+import itertools
+import logging
+import math
+import os
+import random
+import string
+import urllib.parse
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from typing import Any
+
+# Third-party imports
+import anyio
+import httpx
+import orjson
+from dotenv import load_dotenv
+
+# Local application imports
+from cache import coalesce, ttl_cache
+from exceptions import (
+    RiotAPIError,
+    RiotAPINotFoundError,
+    RiotAPIRateLimitError,
+    RiotAPIUnauthorizedError,
+)
+from rate_limit import RiotRateLimiter
+
+load_dotenv()
+
+log = logging.getLogger("riot_mcp")
+
+# Constants
+RIOT_API_BASE = "https://asia.api.riotgames.com"
+RIOT_API_BASE_V2 = "https://sg2.api.riotgames.com"
+RIOT_API_KEY = os.getenv("RIOT_API_KEY")
+if not RIOT_API_KEY:
+    raise RuntimeError("RIOT_API_KEY environment variable is not set")
+ACCOUNT_ENDPOINT = "/riot/account/v1/accounts/by-riot-id/{gameName}/{tagLine}"
+LOL_ACCOUNT_PUUID_ENDPOINT = "/lol/summoner/v4/summoners/by-puuid/{encryptedPUUID}"
+_HEADERS = {
+    "X-Riot-Token": RIOT_API_KEY,
+    "Accept": "application/json"
+}
+_ACCOUNT_URL = RIOT_API_BASE + ACCOUNT_ENDPOINT
+_LOL_ACCOUNT_PUUID_URL = RIOT_API_BASE_V2 + LOL_ACCOUNT_PUUID_ENDPOINT
+# Characters urllib.parse.quote never encodes
+_SAFE_URL_CHARS = frozenset(string.ascii_letters + string.digits + "-_.~")
+# Number of worker tasks sending requests and the queue size they drain
+REQUEST_WORKERS = 8
+REQUEST_QUEUE_SIZE = 100
+# Attempts per request when rate limited, unavailable or unable to connect
+MAX_REQUEST_ATTEMPTS = 4
+# Longest Retry-After, in seconds, to wait out before failing the request
+MAX_RETRY_AFTER = 10.0
+# Transport errors worth retrying; requests are idempotent GETs, and reused
+# connections can turn out to have been closed by the server
+_RETRYABLE_ERRORS = (
+    httpx.ConnectError,
+    httpx.ConnectTimeout,
+    httpx.ReadError,
+    httpx.ReadTimeout,
+    httpx.RemoteProtocolError,
+)
+# Request priorities, lower values are sent first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 5
+# Application rate limits of a Riot development key as (requests, seconds)
+RIOT_RATE_LIMITS = ((20, 1), (100, 120))
+
+# Additional PUUID-keyed lookups merged into get_account_by_name results,
+# keyed by the field name they are stored under
+PUUID_FETCHERS: dict[str, Callable[[str], Awaitable[Any]]] = {}
+
+# Throttle requests locally so bursts wait instead of hitting 429 responses
+rate_limiter = RiotRateLimiter(RIOT_RATE_LIMITS)
+
+# In-flight get_account_by_name lookups, keyed by Riot ID
+_inflight: dict[str, asyncio.Task] = {}
+
+# Request queue and the workers draining it, started on first request
+_queue: asyncio.PriorityQueue | None = None
+_workers: list[asyncio.Task] = []
+_workers_loop: asyncio.AbstractEventLoop | None = None
+# Tie-breaker keeping requests of the same priority in FIFO order
+_request_seq = itertools.count()
+
+# Number of server sessions using the shared client and workers
+_sessions = 0
+_warm_up_task: asyncio.Task | None = None
+
+# Shared HTTP client, created lazily and reused for the lifetime of the process
+_CLIENT: httpx.AsyncClient | None = None
+_client_loop: asyncio.AbstractEventLoop | None = None
+
+def get_client() -> httpx.AsyncClient:
+    """Get the shared HTTP client, creating it on first use.
+    
+    Reusing one client keeps connections to the Riot API alive between
+    requests instead of paying a new TCP and TLS handshake for every call.
+    A client left over from an event loop that has since ended is replaced,
+    since its connections cannot be used from another loop.
+    
+    Returns:
+        httpx.AsyncClient: The shared client
+    """
+    global _CLIENT, _client_loop
+    loop = asyncio.get_running_loop()
+    if _CLIENT is None or _CLIENT.is_closed or _client_loop is not loop:
+        _client_loop = loop
+        _CLIENT = httpx.AsyncClient(
+            http2=True,
+            timeout=30.0,
+            headers=_HEADERS,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+        )
+    return _CLIENT
+
+async def close_client() -> None:
+    """Close the shared HTTP client if it has been created."""
+    global _CLIENT
+    client, _CLIENT = _CLIENT, None
+    # A client from an event loop that has ended can only be dropped
+    if client is not None and _client_loop is asyncio.get_running_loop():
+        await client.aclose()
+
+def start_workers() -> asyncio.PriorityQueue:
+    """Start the request workers if they are not running.
+    
+    Every Riot API request goes through one priority queue drained by a fixed
+    number of workers, which bounds the number of concurrent requests and lets
+    interactive requests skip ahead of background work.
+    
+    Returns:
+        asyncio.PriorityQueue: The queue to put (priority, seq, url, future) jobs on
+    """
+    global _queue, _workers_loop
+    loop = asyncio.get_running_loop()
+    if _queue is not None and _workers_loop is not loop:
+        # The loop that ran the workers has ended; its queue and jobs died with it
+        _queue = None
+        _workers.clear()
+    elif _queue is not None and any(worker.done() for worker in _workers):
+        # A worker has stopped, so start over with a full set
+        _discard_workers()
+    if _queue is None:
+        _workers_loop = loop
+        _queue = asyncio.PriorityQueue(maxsize=REQUEST_QUEUE_SIZE)
+        _workers.extend(
+            asyncio.create_task(_request_worker(_queue)) for _ in range(REQUEST_WORKERS)
+        )
+    return _queue
+
+async def warm_up() -> None:
+    """Open connections to the Riot API hosts ahead of the first tool call.
+    
+    Sends a HEAD request to each host so DNS resolution and the TCP and TLS
+    handshakes happen before a user is waiting. The requests bypass the queue
+    and retries so they never hold a worker, and their responses and errors
+    are ignored since only the connection matters.
+    """
+    await asyncio.gather(
+        *(_warm_up_host(base) for base in (RIOT_API_BASE, RIOT_API_BASE_V2)),
+        return_exceptions=True
+    )
+
+async def _warm_up_host(base_url: str) -> None:
+    """Send a single HEAD request to a Riot API host."""
+    # Skip the warm-up rather than wait out a rate limit pause
+    if await rate_limiter.acquire(max_pause=0):
+        await get_client().head(base_url)
+
+async def stop_workers() -> None:
+    """Cancel the request workers and drop the queue.
+    
+    Requests still waiting in the queue fail with RiotAPIError so their
+    callers do not wait forever.
+    """
+    global _queue
+    if _workers_loop is not asyncio.get_running_loop():
+        # Workers from an event loop that has ended can only be dropped
+        _queue = None
+        _workers.clear()
+        return
+    await asyncio.gather(*_discard_workers(), return_exceptions=True)
+
+def _discard_workers() -> list[asyncio.Task]:
+    """Detach the queue and workers, cancel the workers and fail queued requests.
+    
+    Detaching first means requests made from now on start fresh workers.
+    
+    Returns:
+        list: The cancelled worker tasks
+    """
+    global _queue
+    queue, workers = _queue, list(_workers)
+    _queue = None
+    _workers.clear()
+    for worker in workers:
+        worker.cancel()
+    if queue is not None:
+        while not queue.empty():
+            _, _, _, fut = queue.get_nowait()
+            _fail_on_shutdown(fut)
+    return workers
+
+@asynccontextmanager
+async def client_session() -> AsyncIterator[None]:
+    """Keep the shared HTTP client and request workers open while in use.
+    
+    The client and workers belong to the process and are shared by every
+    server session. The first session to start warms up connections and the
+    last one to end stops the workers and closes the client.
+    """
+    global _sessions, _warm_up_task
+    _sessions += 1
+    if _sessions == 1:
+        # Warm up in the background so the MCP handshake is not delayed
+        _warm_up_task = asyncio.create_task(warm_up())
+    try:
+        yield
+    finally:
+        _sessions -= 1
+        if _sessions == 0:
+            # Shield the teardown from the cancellation that is shutting the server down
+            with anyio.CancelScope(shield=True):
+                await _shutdown()
+
+async def _shutdown() -> None:
+    """Cancel the warm-up, stop the request workers and close the shared client."""
+    global _warm_up_task
+    # Detach first so a session starting while we wait keeps its own warm-up
+    task, _warm_up_task = _warm_up_task, None
+    if task is not None:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+    # A new session may have started during each await; leave its resources alone
+    if _sessions > 0:
+        return
+    await stop_workers()
+    if _sessions > 0:
+        return
+    await close_client()
+
+def _fail_on_shutdown(fut: asyncio.Future) -> None:
+    """Fail a request future because the workers have been stopped."""
+    if not fut.done():
+        fut.set_exception(RiotAPIError("Riot API client is shutting down"))
+
+async def _request_worker(queue: asyncio.PriorityQueue) -> None:
+    """Send queued requests and resolve their futures with the result."""
+    while True:
+        _, _, url, fut = await queue.get()
+        try:
+            # Skip requests whose caller has already given up
+            if fut.done():
+                continue
+            result = await _send_request(url)
+        except asyncio.CancelledError:
+            _fail_on_shutdown(fut)
+            raise
+        except Exception as e:
+            if not fut.done():
+                fut.set_exception(e)
+        else:
+            if not fut.done():
+                fut.set_result(result)
+        finally:
+            queue.task_done()
+
+# Helper function to make requests to the Riot API
+async def make_riot_request(url: str, priority: int = PRIORITY_INTERACTIVE) -> dict[str, Any]:
+    """Make a request to the Riot API with proper error handling.
+    
+    Args:
+        url: The full URL to make the request to
+        priority: Queue priority, lower values are sent first
+        
+    Returns:
+        dict: The JSON response from the API
+        
+    Raises:
+        RiotAPIRateLimitError: If rate limit is exceeded
+        RiotAPIUnauthorizedError: If API key is invalid or missing
+        RiotAPINotFoundError: If the requested resource is not found
+        httpx.RequestError: If there's an issue with the request
+        ValueError: If the response is not valid JSON
+    """
+    queue = start_workers()
+    fut = asyncio.get_running_loop().create_future()
+    await queue.put((priority, next(_request_seq), url, fut))
+    # The workers may have been stopped while we waited for room in the queue
+    if queue is not _queue:
+        _fail_on_shutdown(fut)
+    return await fut
+
+async def _send_request(url: str) -> dict[str, Any]:
+    """Send a request to the Riot API and check the response.
+    
+    Args:
+        url: The full URL to make the request to
+        
+    Returns:
+        dict: The JSON response from the API
+    """
+    client = get_client()
+    for attempt in range(MAX_REQUEST_ATTEMPTS):
+        last_attempt = attempt == MAX_REQUEST_ATTEMPTS - 1
+        # Fail fast rather than hold the caller through a long rate limit pause
+        if not await rate_limiter.acquire(max_pause=MAX_RETRY_AFTER):
+            raise RiotAPIRateLimitError(
+                f"Rate limit exceeded. Retry after: {math.ceil(rate_limiter.paused_for())} seconds"
+            )
+        try:
+            response = await client.get(url)
+        except _RETRYABLE_ERRORS as e:
+            if last_attempt:
+                raise RiotAPIError(f"Request to Riot API failed: {str(e)}") from e
+            await asyncio.sleep(0.1 * 2 ** attempt)
+            continue
+        except httpx.RequestError as e:
+            raise RiotAPIError(f"Request to Riot API failed: {str(e)}") from e
+        rate_limiter.update(response.headers)
+        
+        if response.status_code not in (429, 503):
+            break
+        retry_after = _retry_after(response)
+        if response.status_code == 429:
+            # Pause every worker, not only this one, until the limit resets
+            rate_limiter.pause(retry_after)
+        if last_attempt or retry_after > MAX_RETRY_AFTER:
+            break
+        
+        # Wait out rate limits and temporary outages instead of failing the call.
+        # A 429 waits in rate_limiter.acquire, a 503 waits here. The jitter grows
+        # with each attempt so clients sharing an API key do not retry together.
+        if response.status_code == 503:
+            await asyncio.sleep(retry_after)
+        await asyncio.sleep(random.uniform(0, 0.25 * 2 ** attempt))
+    
+    if response.status_code == 429:
+        retry_after = response.headers.get('Retry-After', 'unknown')
+        raise RiotAPIRateLimitError(
+            f"Rate limit exceeded. Retry after: {retry_after} seconds"
+        )
+    elif response.status_code == 401:
+        raise RiotAPIUnauthorizedError("Invalid or missing API key")
+    elif response.status_code == 404:
+        raise RiotAPINotFoundError(f"Resource not found: {url}")
+    elif response.status_code >= 500:
+        raise RiotAPIError(f"Riot API server error: {response.status_code}")
+        
+    response.raise_for_status()
+    try:
+        return orjson.loads(response.content)
+    except ValueError as e:
+        raise ValueError(f"Invalid JSON response from Riot API: {str(e)}") from e
+
+def _retry_after(response: httpx.Response) -> float:
+    """Get the seconds to wait before retrying, from the Retry-After header.
+    
+    Defaults to one second if the header is missing or not a number.
+    """
+    try:
+        return float(response.headers.get('Retry-After', 1.0))
+    except ValueError:
+        return 1.0
+
+def _quote(value: str) -> str:
+    """URL-encode a path segment, skipping the work when nothing needs encoding."""
+    if value.isascii() and _SAFE_URL_CHARS.issuperset(value):
+        return value
+    return urllib.parse.quote(value)
+
+@functools.lru_cache(maxsize=4096)
+def _build_account_url(game_name: str, tag_line: str) -> str:
+    """Build the account-by-Riot-ID URL with proper URL encoding."""
+    return _ACCOUNT_URL.replace("{gameName}", _quote(game_name)).replace(
+        "{tagLine}", _quote(tag_line)
+    )
+
+@functools.lru_cache(maxsize=4096)
+def _build_lol_account_url(puuid: str) -> str:
+    """Build the summoner-by-PUUID URL."""
+    return _LOL_ACCOUNT_PUUID_URL.replace("{encryptedPUUID}", puuid)
+
+def _riot_id_key(game_name: str, tag_line: str) -> str:
+    """Build a lookup key for a Riot ID.
+    
+    Riot IDs are case-insensitive, so the key is the same regardless of case.
+    """
+    return f"{game_name.casefold()}#{tag_line.casefold()}"
+
+@ttl_cache(ttl=300, negative_ttl=60, key=_riot_id_key)
+async def _fetch_account(game_name: str, tag_line: str) -> dict[str, Any] | None:
+    """Fetch a Riot account by game name and tag line, with caching.
+    
+    Args:
+        game_name: The in-game name of the player
+        tag_line: The player's tag line (without the '#')
+        
+    Returns:
+        dict: Player account data if found, None if not found
+    """
+    try:
+        return await make_riot_request(_build_account_url(game_name, tag_line))
+    except RiotAPINotFoundError:
+        # Account not found is a normal case, return None
+        return None
+
+@ttl_cache(ttl=600, negative_ttl=60, key=lambda puuid: puuid)
+async def _fetch_lol_account(puuid: str) -> dict[str, Any] | None:
+    """Fetch a LoL account by PUUID, with caching.
+    
+    Args:
+        puuid: The player's PUUID
+        
+    Returns:
+        dict: Player account data if found, None if not found
+    """
+    try:
+        return await make_riot_request(_build_lol_account_url(puuid))
+    except RiotAPINotFoundError:
+        # Account not found is a normal case, return None
+        return None
+
+# Get a Riot account by game name and tag line
+async def get_account(game_name: str, tag_line: str) -> dict[str, Any] | None:
+    """Get a Riot account by game name and tag line.
+    
+    Args:
+        game_name: The in-game name of the player
+        tag_line: The player's tag line (without the '#')
+        
+    Returns:
+        dict: Player account data if found, None if not found
+        
+    Raises:
+        ValueError: If input parameters are invalid or missing required data
+        RiotAPIError: For Riot API related errors
+        httpx.RequestError: For network-related errors
+    """
+    if type(game_name) is not str or not game_name:
+        raise ValueError("Game name must be a non-empty string")
+    if type(tag_line) is not str or not tag_line:
+        raise ValueError("Tag line must be a non-empty string")
+    
+    try:
+        return await _fetch_account(game_name, tag_line)
+    except RiotAPIError as e:
+        log.warning("Riot API error: %s", e)
+        raise
+
+async def get_account_by_name(game_name: str, tag_line: str) -> dict[str, Any] | None:
+    """Get a Riot account by game name and tag line.
+    
+    This function first retrieves the account information using the Riot ID (game name and tag line),
+    then fetches the associated League of Legends account details using the PUUID.
+    
+    Args:
+        game_name: The in-game name of the player (case-insensitive)
+        tag_line: The player's tag line (without the '#')
+        
+    Returns:
+        dict: Player account data if found, None if not found
+        
+    Raises:
+        ValueError: If input parameters are invalid or missing required data
+        RiotAPIError: For Riot API related errors
+        httpx.RequestError: For network-related errors
+    """
+    if type(game_name) is not str or not game_name:
+        raise ValueError("Game name must be a non-empty string")
+    if type(tag_line) is not str or not tag_line:
+        raise ValueError("Tag line must be a non-empty string")
+    
+    # Share the result of an identical lookup that is already running
+    return await coalesce(
+        _inflight,
+        _riot_id_key(game_name, tag_line),
+        lambda: _lookup_account_by_name(game_name, tag_line)
+    )
+
+async def _lookup_account_by_name(game_name: str, tag_line: str) -> dict[str, Any] | None:
+    """Look up a Riot account and its League of Legends account details.
+    
+    Args:
+        game_name: The in-game name of the player
+        tag_line: The player's tag line (without the '#')
+        
+    Returns:
+        dict: Player account data if found, None if not found
+    """
+    # Get the account information first, reading the cache directly
+    # so a warm lookup goes straight to the PUUID-keyed requests
+    account = _fetch_account.cache.get(_riot_id_key(game_name, tag_line))
+    if account is None:
+        account = await get_account(game_name, tag_line)
+    if not account:
+        return None
+        
+    # Get the League of Legends account details and any other
+    # PUUID-keyed data concurrently
+    puuid = account['puuid']
+    lol_account, *extra = await asyncio.gather(
+        get_lol_account_by_puuid(puuid),
+        *(fetch(puuid) for fetch in PUUID_FETCHERS.values()),
+        return_exceptions=True
+    )
+    if isinstance(lol_account, BaseException):
+        raise lol_account
+    if not lol_account:
+        log.info("No League of Legends account found for PUUID: %s", puuid)
+        return None
+        
+    # Additional data is optional, so leave out any lookup that failed
+    extras = {}
+    for field, result in zip(PUUID_FETCHERS, extra):
+        if isinstance(result, BaseException):
+            log.warning("Failed to fetch %s for PUUID %s: %s", field, puuid, result)
+        else:
+            extras[field] = result
+        
+    # Combine the account information
+    return {
+        **account,
+        'lol_account': lol_account,
+        **extras
+    }
+
+# Get a LoL account by PUUID
+async def get_lol_account_by_puuid(puuid: str) -> dict[str, Any] | None:
+    """Get a LoL account by PUUID.
+    
+    Args:
+        puuid: The player's PUUID
+        
+    Returns:
+        dict: Player account data if found, None if not found
+        
+    Raises:
+        ValueError: If PUUID is invalid or missing required data
+        RiotAPIError: For Riot API related errors
+        httpx.RequestError: For network-related errors
+    """
+    if type(puuid) is not str or not puuid:
+        raise ValueError("PUUID must be a non-empty string")
+    
+    try:
+        return await _fetch_lol_account(puuid)
+    except RiotAPIError as e:
+        log.warning("Riot API error for PUUID %s: %s", puuid, e)
+        raise
@@ -0,0 +1,109 @@
+"""Tests for the async TTL cache."""
+
+# Standard library imports
+import asyncio
+import unittest
+from unittest import mock
+
+# Local application imports
+from cache import AsyncTTLCache, coalesce, ttl_cache
+
+class CoalesceTest(unittest.IsolatedAsyncioTestCase):
+    async def test_callers_share_one_task_until_it_finishes(self):
+        inflight = {}
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return calls
+
+        results = await asyncio.gather(*(coalesce(inflight, "key", work) for _ in range(3)))
+        self.assertEqual(results, [1, 1, 1])
+        self.assertEqual(inflight, {})
+        self.assertEqual(await coalesce(inflight, "key", work), 2)
+
+class AsyncTTLCacheTest(unittest.IsolatedAsyncioTestCase):
+    async def test_concurrent_misses_share_one_fetch(self):
+        cache = AsyncTTLCache(ttl=60)
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"puuid": "abc"}
+
+        results = await asyncio.gather(*(cache.get_or_fetch("key", fetch) for _ in range(5)))
+        self.assertEqual(calls, 1)
+        self.assertEqual(results, [{"puuid": "abc"}] * 5)
+        self.assertEqual(await cache.get_or_fetch("key", fetch), {"puuid": "abc"})
+        self.assertEqual(calls, 1)
+
+    async def test_concurrent_misses_share_one_failure(self):
+        cache = AsyncTTLCache(ttl=60)
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            raise RuntimeError("unavailable")
+
+        results = await asyncio.gather(
+            *(cache.get_or_fetch("key", fetch) for _ in range(5)), return_exceptions=True
+        )
+        self.assertEqual(calls, 1)
+        self.assertTrue(all(isinstance(result, RuntimeError) for result in results))
+        # Failures are not cached
+        with self.assertRaises(RuntimeError):
+            await cache.get_or_fetch("key", fetch)
+        self.assertEqual(calls, 2)
+
+    async def test_cancelled_caller_does_not_cancel_shared_fetch(self):
+        cache = AsyncTTLCache(ttl=60)
+
+        async def fetch():
+            await asyncio.sleep(0.05)
+            return "value"
+
+        first = asyncio.create_task(cache.get_or_fetch("key", fetch))
+        second = asyncio.create_task(cache.get_or_fetch("key", fetch))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        self.assertEqual(await second, "value")
+
+    async def test_none_results_use_negative_ttl(self):
+        cache = AsyncTTLCache(ttl=60, negative_ttl=1)
+        with mock.patch("cache.time.monotonic", return_value=100.0):
+            cache.set("found", "value")
+            cache.set("missing", None)
+        with mock.patch("cache.time.monotonic", return_value=102.0):
+            self.assertEqual(cache.get("found"), "value")
+            self.assertEqual(cache.get("missing", "expired"), "expired")
+
+    async def test_maxsize_drops_oldest_entry(self):
+        cache = AsyncTTLCache(ttl=60, maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.set("c", 3)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("c"), 3)
+
+class TTLCacheDecoratorTest(unittest.IsolatedAsyncioTestCase):
+    async def test_key_and_keyword_arguments(self):
+        calls = []
+
+        @ttl_cache(ttl=60, key=lambda name, tag="": f"{name.casefold()}#{tag.casefold()}")
+        async def lookup(name, tag=""):
+            calls.append((name, tag))
+            return name
+
+        self.assertEqual(await lookup("Faker", tag="KR1"), "Faker")
+        self.assertEqual(await lookup("faker", "kr1"), "Faker")
+        self.assertEqual(calls, [("Faker", "KR1")])
+        self.assertEqual(lookup.cache.get("faker#kr1"), "Faker")
+
+if __name__ == "__main__":
+    unittest.main()
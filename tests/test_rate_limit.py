@@ -0,0 +1,65 @@
+"""Tests for the client-side Riot API rate limiter."""
+
+# Standard library imports
+import time
+import unittest
+
+# Local application imports
+from rate_limit import RiotRateLimiter, SlidingWindow
+
+class RiotRateLimiterTest(unittest.IsolatedAsyncioTestCase):
+    async def acquire_times(self, limiter: RiotRateLimiter, count: int) -> list[float]:
+        times = []
+        for _ in range(count):
+            await limiter.acquire()
+            times.append(time.monotonic())
+        return times
+
+    def assert_within_limit(self, times: list[float], limit: int, period: float) -> None:
+        for start in times:
+            in_window = [t for t in times if start <= t < start + period]
+            self.assertLessEqual(len(in_window), limit)
+
+    async def test_burst_never_exceeds_limit_per_period(self):
+        limiter = RiotRateLimiter(((5, 0.2), (8, 0.6)))
+        times = await self.acquire_times(limiter, 12)
+        self.assert_within_limit(times, 5, 0.2)
+        self.assert_within_limit(times, 8, 0.6)
+
+    async def test_update_accounts_for_requests_counted_by_server(self):
+        limiter = RiotRateLimiter(((5, 1),))
+        limiter.update({"X-App-Rate-Limit-Count": "4:1"})
+        start = time.monotonic()
+        await limiter.acquire()
+        await limiter.acquire()
+        self.assertGreaterEqual(time.monotonic() - start, 0.9)
+
+    async def test_update_ignores_unknown_windows_and_bad_entries(self):
+        limiter = RiotRateLimiter(((5, 1),))
+        limiter.update({"X-App-Rate-Limit-Count": "3:10,bad,:"})
+        self.assertEqual(limiter.windows[1].delay(time.monotonic()), 0.0)
+
+    async def test_pause_holds_back_every_request(self):
+        limiter = RiotRateLimiter(((100, 1),))
+        limiter.pause(0.2)
+        start = time.monotonic()
+        await limiter.acquire()
+        self.assertGreaterEqual(time.monotonic() - start, 0.19)
+        self.assertEqual(limiter.paused_for(), 0.0)
+
+    async def test_acquire_refuses_pause_longer_than_max_pause(self):
+        limiter = RiotRateLimiter(((100, 1),))
+        limiter.pause(120)
+        self.assertFalse(await limiter.acquire(max_pause=10))
+        self.assertGreater(limiter.paused_for(), 110)
+
+class SlidingWindowTest(unittest.TestCase):
+    def test_delay_until_oldest_request_leaves_window(self):
+        window = SlidingWindow(2, 1.0)
+        window.record(10.0)
+        window.record(10.5)
+        self.assertAlmostEqual(window.delay(10.6), 0.4)
+        self.assertEqual(window.delay(11.0), 0.0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,288 @@
+"""Tests for the Riot API client."""
+
+# Standard library imports
+import asyncio
+import os
+import unittest
+from unittest import mock
+
+# riot_client requires an API key at import
+os.environ.setdefault("RIOT_API_KEY", "test-key")
+
+# Third-party imports
+import httpx
+
+# Local application imports
+import riot_client
+from exceptions import RiotAPIError, RiotAPIRateLimitError
+from rate_limit import RiotRateLimiter
+
+class GetAccountByNameTest(unittest.IsolatedAsyncioTestCase):
+    async def test_concurrent_lookups_survive_first_caller_cancelling(self):
+        async def slow_lookup(game_name, tag_line):
+            await asyncio.sleep(0.05)
+            return {"puuid": "abc"}
+
+        lookup = mock.AsyncMock(side_effect=slow_lookup)
+        with mock.patch.object(riot_client, "_lookup_account_by_name", lookup):
+            first = asyncio.create_task(riot_client.get_account_by_name("Faker", "KR1"))
+            second = asyncio.create_task(riot_client.get_account_by_name("faker", "kr1"))
+            await asyncio.sleep(0.01)
+            first.cancel()
+            self.assertEqual(await second, {"puuid": "abc"})
+        lookup.assert_awaited_once()
+        self.assertEqual(riot_client._inflight, {})
+
+class LookupAccountByNameTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        riot_client._fetch_account.cache.clear()
+        for name, result in (
+            ("get_account", {"puuid": "abc"}),
+            ("get_lol_account_by_puuid", {"summonerLevel": 30}),
+        ):
+            patcher = mock.patch.object(riot_client, name, mock.AsyncMock(return_value=result))
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def test_failed_extra_lookup_is_left_out(self):
+        fetchers = {
+            "mastery": mock.AsyncMock(return_value=[{"championId": 1}]),
+            "ranked": mock.AsyncMock(side_effect=RiotAPIError("unavailable")),
+        }
+        with mock.patch.dict(riot_client.PUUID_FETCHERS, fetchers):
+            with self.assertLogs("riot_mcp", "WARNING"):
+                result = await riot_client._lookup_account_by_name("Faker", "KR1")
+        self.assertEqual(result, {
+            "puuid": "abc",
+            "lol_account": {"summonerLevel": 30},
+            "mastery": [{"championId": 1}],
+        })
+
+    async def test_failed_lol_account_lookup_is_raised(self):
+        riot_client.get_lol_account_by_puuid.side_effect = RiotAPIError("unavailable")
+        with self.assertRaises(RiotAPIError):
+            await riot_client._lookup_account_by_name("Faker", "KR1")
+
+class RequestWorkersTest(unittest.IsolatedAsyncioTestCase):
+    async def test_stop_workers_fails_running_and_queued_requests(self):
+        async def slow_send(url):
+            await asyncio.sleep(10)
+
+        with mock.patch.object(riot_client, "_send_request", slow_send):
+            requests = [
+                asyncio.create_task(riot_client.make_riot_request(f"https://example.com/{i}"))
+                for i in range(riot_client.REQUEST_WORKERS + 4)
+            ]
+            await asyncio.sleep(0.01)
+            await riot_client.stop_workers()
+            results = await asyncio.wait_for(
+                asyncio.gather(*requests, return_exceptions=True), timeout=1
+            )
+        self.assertTrue(all(isinstance(result, RiotAPIError) for result in results))
+        self.assertEqual(riot_client._workers, [])
+        self.assertIsNone(riot_client._queue)
+
+    async def test_workers_are_restarted_after_one_stops(self):
+        async def send(url):
+            return {"url": url}
+
+        self.addAsyncCleanup(riot_client.stop_workers)
+        riot_client.start_workers()
+        stopped = riot_client._workers[0]
+        stopped.cancel()
+        await asyncio.gather(stopped, return_exceptions=True)
+        with mock.patch.object(riot_client, "_send_request", send):
+            self.assertEqual(
+                await riot_client.make_riot_request("https://example.com/"),
+                {"url": "https://example.com/"},
+            )
+        self.assertNotIn(stopped, riot_client._workers)
+        self.assertFalse(any(worker.done() for worker in riot_client._workers))
+
+class EventLoopChangeTest(unittest.TestCase):
+    def test_workers_and_client_are_rebuilt_for_a_new_event_loop(self):
+        async def send(url):
+            return {"url": url}
+
+        async def request():
+            client = riot_client.get_client()
+            result = await asyncio.wait_for(
+                riot_client.make_riot_request("https://example.com/"), timeout=2
+            )
+            return client, result
+
+        # Neither run stops the workers, as when a script imports riot_client
+        with mock.patch.object(riot_client, "_send_request", send):
+            first_client, first = asyncio.run(request())
+            second_client, second = asyncio.run(request())
+        self.assertEqual(first, second)
+        self.assertIsNot(first_client, second_client)
+        asyncio.run(riot_client.stop_workers())
+        asyncio.run(riot_client.close_client())
+
+class SendRequestTest(unittest.IsolatedAsyncioTestCase):
+    def use_transport(self, handler):
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        patcher = mock.patch.object(riot_client, "get_client", return_value=client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addAsyncCleanup(client.aclose)
+
+    async def test_transient_transport_errors_are_retried(self):
+        errors = [httpx.ConnectTimeout("timed out"), httpx.RemoteProtocolError("closed")]
+
+        def handler(request):
+            if errors:
+                raise errors.pop(0)
+            return httpx.Response(200, json={"puuid": "abc"})
+
+        self.use_transport(handler)
+        self.assertEqual(await riot_client._send_request("https://example.com/"), {"puuid": "abc"})
+        self.assertEqual(errors, [])
+
+    async def test_gives_up_after_max_attempts(self):
+        attempts = 0
+
+        def handler(request):
+            nonlocal attempts
+            attempts += 1
+            raise httpx.ReadError("reset")
+
+        self.use_transport(handler)
+        with mock.patch.object(riot_client.asyncio, "sleep", mock.AsyncMock()):
+            with self.assertRaises(RiotAPIError):
+                await riot_client._send_request("https://example.com/")
+        self.assertEqual(attempts, riot_client.MAX_REQUEST_ATTEMPTS)
+
+class RetryAfterTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        patcher = mock.patch.object(
+            riot_client, "rate_limiter", RiotRateLimiter(riot_client.RIOT_RATE_LIMITS)
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def use_responses(self, responses):
+        sent = []
+
+        def handler(request):
+            sent.append(request)
+            return responses.pop(0)
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        patcher = mock.patch.object(riot_client, "get_client", return_value=client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addAsyncCleanup(client.aclose)
+        return sent
+
+    async def test_short_retry_after_is_waited_out(self):
+        sent = self.use_responses([
+            httpx.Response(429, headers={"Retry-After": "0.1"}),
+            httpx.Response(200, json={"puuid": "abc"}),
+        ])
+        self.assertEqual(await riot_client._send_request("https://example.com/"), {"puuid": "abc"})
+        self.assertEqual(len(sent), 2)
+
+    async def test_long_retry_after_fails_and_pauses_other_requests(self):
+        sent = self.use_responses([httpx.Response(429, headers={"Retry-After": "120"})])
+        with self.assertRaises(RiotAPIRateLimitError):
+            await riot_client._send_request("https://example.com/1")
+        # Other requests fail without reaching the API until the pause ends
+        with self.assertRaises(RiotAPIRateLimitError):
+            await asyncio.wait_for(riot_client._send_request("https://example.com/2"), timeout=1)
+        self.assertEqual(len(sent), 1)
+
+class WarmUpTest(unittest.IsolatedAsyncioTestCase):
+    async def test_sends_one_head_request_per_host_without_retrying(self):
+        sent = []
+
+        def handler(request):
+            sent.append((request.method, str(request.url)))
+            return httpx.Response(429, headers={"Retry-After": "1"})
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        self.addAsyncCleanup(client.aclose)
+        with mock.patch.object(riot_client, "get_client", return_value=client), \
+                mock.patch.object(
+                    riot_client, "rate_limiter", RiotRateLimiter(riot_client.RIOT_RATE_LIMITS)
+                ), \
+                mock.patch.object(riot_client, "start_workers") as start_workers:
+            await asyncio.wait_for(riot_client.warm_up(), timeout=1)
+        self.assertCountEqual(sent, [
+            ("HEAD", riot_client.RIOT_API_BASE),
+            ("HEAD", riot_client.RIOT_API_BASE_V2),
+        ])
+        start_workers.assert_not_called()
+
+class ClientSessionTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        patcher = mock.patch.object(riot_client, "warm_up", mock.AsyncMock())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_last_session_to_end_shuts_down(self):
+        async with riot_client.client_session():
+            client = riot_client.get_client()
+            riot_client.start_workers()
+            async with riot_client.client_session():
+                pass
+            # Another session is still running
+            self.assertFalse(client.is_closed)
+            self.assertEqual(len(riot_client._workers), riot_client.REQUEST_WORKERS)
+        self.assertTrue(client.is_closed)
+        self.assertEqual(riot_client._workers, [])
+
+    async def test_session_starting_during_shutdown_keeps_its_resources(self):
+        calls = 0
+        completed = asyncio.Event()
+
+        async def warm_up():
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    # Keep the first session's shutdown busy for a while
+                    await asyncio.sleep(0.05)
+                    raise
+            await asyncio.sleep(0.1)
+            completed.set()
+
+        async def short_session():
+            async with riot_client.client_session():
+                await asyncio.sleep(0)
+
+        with mock.patch.object(riot_client, "warm_up", warm_up):
+            first = asyncio.create_task(short_session())
+            await asyncio.sleep(0.02)
+            async with riot_client.client_session():
+                riot_client.start_workers()
+                await first
+                self.assertIsNotNone(riot_client._warm_up_task)
+                self.assertEqual(len(riot_client._workers), riot_client.REQUEST_WORKERS)
+                await asyncio.wait_for(completed.wait(), timeout=1)
+
+    async def test_shutdown_completes_when_session_is_cancelled(self):
+        entered = asyncio.Event()
+
+        async def session():
+            async with riot_client.client_session():
+                client = riot_client.get_client()
+                riot_client.start_workers()
+                entered.set()
+                await asyncio.sleep(10)
+            return client
+
+        task = asyncio.create_task(session())
+        await entered.wait()
+        client = riot_client._CLIENT
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+        self.assertTrue(client.is_closed)
+        self.assertEqual(riot_client._workers, [])
+
+if __name__ == "__main__":
+    unittest.main()